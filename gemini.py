@@ -1,20 +1,92 @@
 import os
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import sqlite3
+import zlib
+import aiohttp
+import lxml.html
+from lxml.etree import XPath, ParserError
 import re
 from urllib.parse import urljoin
 
 # --- Configuration ---
+# Scheme and host of the archive every scraped page is served from.
+ARCHIVE_HOST = "https://web.archive.org"
 # The starting URL for the scrape.
 BASE_URL = "https://web.archive.org/web/20160501142300/http://gmc.yoyogames.com/"
 # The root directory to save the scraped data.
 OUTPUT_DIR = "forums"
 # Delay between requests to be polite to the server.
 REQUEST_DELAY_SECONDS = 2
+# Upper bound on requests in flight at once, across all topics.
+MAX_CONCURRENT_REQUESTS = 16
+# Upper bound on open connections to a single host.
+MAX_CONNECTIONS_PER_HOST = 8
+# How long an idle connection is kept open for reuse.
+KEEPALIVE_SECONDS = 60
+# SQLite file holding every page fetched so far, so re-runs skip the network.
+CACHE_PATH = "gmc_cache.sqlite"
+# Pending file writes allowed before scrapers wait on the writer.
+WRITE_QUEUE_SIZE = 256
+# Most files written in one trip to the writer thread.
+WRITE_BATCH_SIZE = 32
+# Suffix of a topic file still being written; it's renamed once the topic is complete.
+PARTIAL_SUFFIX = ".part"
+
+# --- Output Formatting ---
+
+# Separator written after every post in a topic file.
+_SEP = "\n" + "=" * 80 + "\n"
+
+# --- Compiled Patterns ---
+
+# Date of last activity in a topic row, like "25 December 2019"
+_DATE_RE = re.compile(r'(\d{1,2}\s\w+\s\d{4})')
+# Post number in a post's date line, like "#12"
+_POSTNUM_RE = re.compile(r'#\d+')
+# Characters that aren't allowed in filenames
+_SANI_CHARS = re.compile(r'[\\/*?:"<>|]')
+# Runs of whitespace and underscores in filenames
+_SANI_WS = re.compile(r'[\s_]+')
+# Topic id in a topic URL, like "showtopic=12345"
+_TOPIC_ID_RE = re.compile(r'showtopic=(\d+)')
+
+# --- Compiled XPath Queries ---
+
+def _has_class(name):
+    """Returns an XPath predicate matching elements that carry the given CSS class."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Topic pages
+POST_WRAPS = XPath(f"//div[{_has_class('post_wrap')}]")
+# The rest are relative to a post's wrapper.
+POST_BODY = XPath(f".//div[{_has_class('post')} and {_has_class('entry-content')}]")
+AUTHOR = XPath(f".//h3[{_has_class('author')}]")
+POSTED = XPath(f".//p[{_has_class('posted_info')}]")
+SIGNATURE = XPath(f".//div[{_has_class('signature')}]")
+NEXT = XPath("//a[@rel='next']/@href")
+
+# Forum pages
+TOPIC_ROWS = XPath(f"//table[{_has_class('ipb_table')}]//tr[starts-with(@class, 'row')]")
+TOPIC_LINK = XPath(f".//td[{_has_class('col_f_topic')}]//a[contains(@href, 'showtopic=')]")
+LAST_ACTION = XPath(f".//td[{_has_class('col_f_lastact')}]")
+
+# Forum index
+CATEGORY_TABLES = XPath(f"//table[{_has_class('ipb_table')}]")
+FORUM_LINK = XPath(".//td//h4//a[contains(@href, 'showforum=')]")
+PARENT_TD = XPath("ancestor::td[1]")
+DESC_SPAN = XPath(f".//span[{_has_class('desc')}]")
+SUBFORUM_LINKS = XPath(".//a[contains(@href, 'showforum=')]")
 
 # --- Helper Functions ---
 
+@lru_cache(maxsize=256)
+def _base_address(base):
+    """Returns a page URL without its query or fragment."""
+    return base.split('#', 1)[0].split('?', 1)[0]
+
 # FIXED: Added a robust URL resolver function to build complete URLs.
 def resolve_url(base, href):
     """Creates a full, requestable URL from a link found on an archive page."""
@@ -23,226 +95,569 @@ def resolve_url(base, href):
         return href
     # If href is a path starting with /web/, it's an absolute path from the archive root.
     if href.startswith('/web/'):
-        return f"https://web.archive.org{href}"
+        return f"{ARCHIVE_HOST}{href}"
+    # Query-only links are common enough to skip urljoin's parsing. A bare '?'
+    # keeps the base's query, so leave that one to urljoin.
+    if href.startswith('?') and len(href) > 1:
+        return _base_address(base) + href
     # Otherwise, join it with the base URL of the current page.
     return urljoin(base, href)
 
-def make_soup(url):
-    """Fetches a URL and returns a BeautifulSoup object with a retry mechanism."""
+def make_session():
+    """Creates the HTTP session shared by every request of a scrape.
+
+    Connections are kept alive and pooled, and DNS lookups are cached for
+    the whole run, so each fetch reuses an open TLS connection when one is
+    available.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONCURRENT_REQUESTS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_SECONDS,
+        ttl_dns_cache=None,
+    )
+    timeout = aiohttp.ClientTimeout(total=30)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+def open_cache(path):
+    """Opens the on-disk page cache, creating it if it doesn't exist."""
+    cache = sqlite3.connect(path)
+    cache.execute("PRAGMA journal_mode=WAL")
+    cache.execute("PRAGMA synchronous=NORMAL")
+    cache.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, body BLOB NOT NULL)")
+    return cache
+
+def cache_get(cache, url):
+    """Returns the cached body for a URL, or None if it hasn't been fetched yet."""
+    row = cache.execute("SELECT body FROM pages WHERE url = ?", (url,)).fetchone()
+    return zlib.decompress(row[0]) if row else None
+
+def cache_put(cache, url, body):
+    """Stores a page body in the cache, compressed."""
+    with cache:
+        cache.execute("INSERT OR REPLACE INTO pages (url, body) VALUES (?, ?)", (url, zlib.compress(body)))
+
+def cache_drop(cache, url):
+    """Removes a page from the cache, so the next run fetches it again."""
+    with cache:
+        cache.execute("DELETE FROM pages WHERE url = ?", (url,))
+
+class PageUnavailable(Exception):
+    """Raised when a page is permanently missing, like a 404 for a page the archive never captured."""
+
+
+# Client errors that are worth retrying: request timeout and rate limiting.
+TRANSIENT_CLIENT_STATUSES = {408, 429}
+
+async def fetch(session, cache, url, sem):
+    """Fetches a URL and returns the response body with a retry mechanism.
+
+    Pages already in the cache are returned without touching the network or
+    waiting out the request delay. Returns None if the page still failed
+    after every retry, and raises PageUnavailable without retrying if the
+    server answers with a client error, since asking again won't help.
+    """
+    body = cache_get(cache, url)
+    if body is not None:
+        return body
+
     retries = 3
     delay = 5  # Initial delay in seconds
     for attempt in range(retries):
-        print(f"Fetching: {url}")
         try:
-            time.sleep(REQUEST_DELAY_SECONDS)
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-            return BeautifulSoup(response.text, 'html.parser')
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching {url}: {e}")
+            async with sem:
+                print(f"Fetching: {url}")
+                await asyncio.sleep(REQUEST_DELAY_SECONDS)
+                # aiohttp asks for gzip/deflate transfer and decompresses transparently.
+                async with session.get(url) as response:
+                    response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+                    body = await response.read()
+            # A blank page can't be parsed, so don't let it stick across runs.
+            if response.status == 200 and body.strip():
+                cache_put(cache, url, body)
+            return body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Timeouts carry no message, so fall back to the exception's name.
+            print(f"Error fetching {url}: {e or type(e).__name__}")
+            if (isinstance(e, aiohttp.ClientResponseError) and 400 <= e.status < 500
+                    and e.status not in TRANSIENT_CLIENT_STATUSES):
+                raise PageUnavailable(url) from e
             if attempt < retries - 1:
                 print(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
+                await asyncio.sleep(delay)
                 delay *= 2  # Exponential backoff
             else:
                 print(f"Max retries exceeded for {url}.")
                 return None
     return None
 
+async def parse_tree(session, cache, url, sem):
+    """Fetches a URL and returns the parsed lxml document, or None if the fetch or parse failed."""
+    try:
+        content = await fetch(session, cache, url, sem)
+    except PageUnavailable:
+        return None
+    if content is None:
+        return None
+    try:
+        # Hand lxml the raw bytes so it can detect the encoding itself.
+        return lxml.html.document_fromstring(content)
+    except ParserError as e:
+        print(f"Error parsing {url}: {e}")
+        cache_drop(cache, url)
+        return None
+
+
+def join_text(pieces, separator=""):
+    """Joins the stripped, non-empty pieces of text, like BeautifulSoup's get_text(strip=True)."""
+    return separator.join(text.strip() for text in pieces if text.strip())
+
+def get_text(node, separator=""):
+    """Returns the text of a node and its descendants, stripped and joined by separator."""
+    return join_text(node.itertext(), separator)
+
+def short_text(node):
+    """Returns the same text as get_text(node) for small nodes like a post's author line.
+
+    Wrappers around a single element, like <h3><span><a>Name</a></span></h3>,
+    are followed down to the innermost element. If that has no children, its
+    own text is the answer and no text pieces are collected. Anything else
+    falls back to get_text().
+    """
+    while (len(node) == 1 and isinstance(node[0].tag, str)
+           and not (node.text or '').strip() and not (node[0].tail or '').strip()):
+        node = node[0]
+    if len(node) == 0:
+        return (node.text or '').strip()
+    return get_text(node)
+
+# Quotes and code blocks left out of post text, as tag -> class.
+POST_SKIP_CLASSES = {'div': 'blockquote', 'pre': 'prettyprint'}
+
+def iter_post_text(node):
+    """Yields the text pieces of a post in one pass, skipping quotes and code blocks."""
+    if node.text:
+        yield node.text
+    for child in node:
+        # Comments have a non-string tag; their text isn't part of the post.
+        if isinstance(child.tag, str):
+            skip_class = POST_SKIP_CLASSES.get(child.tag)
+            if skip_class is None or skip_class not in child.get('class', '').split():
+                yield from iter_post_text(child)
+        if child.tail:
+            yield child.tail
+
+def post_text(node):
+    """Returns the text pieces of a post, leaving out quotes and code blocks.
+
+    Most posts have neither, and for those the filtering walk is skipped in
+    favor of lxml's own itertext(). The check stops at the first match.
+    """
+    has_skipped = any(
+        POST_SKIP_CLASSES[el.tag] in el.get('class', '').split()
+        for el in node.iterdescendants('div', 'pre')
+    )
+    return iter_post_text(node) if has_skipped else node.itertext()
+
+def first(results):
+    """Returns the first result of an XPath query, or None if nothing matched."""
+    return results[0] if results else None
 
 def sanitize_filename(name):
     """Removes invalid characters from a string to make it a valid filename."""
     name = name.strip()
-    name = re.sub(r'[\\/*?:"<>|]', "_", name)
-    name = re.sub(r'[\s_]+', '_', name)
+    name = _SANI_CHARS.sub("_", name)
+    name = _SANI_WS.sub('_', name)
     # Truncate long filenames to avoid OS limits
     return name[:100]
 
-def write_to_file(filepath, content):
-    """Writes content to a file, creating directories if they don't exist."""
+# Directories already created during this run.
+_created_dirs = set()
+
+def ensure_dir(path):
+    """Creates a directory and its parents, at most once per run."""
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+
+def write_to_file(filepath, content, mode='w'):
+    """Writes or appends content to a file, creating directories if they don't exist."""
     try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
+        ensure_dir(os.path.dirname(filepath))
+        with open(filepath, mode, encoding='utf-8') as f:
             f.write(content)
     except OSError as e:
         print(f"Error writing to file {filepath}: {e}")
 
+def finish_file(filepath):
+    """Moves a completed partial file into place under its final name."""
+    try:
+        os.replace(filepath + PARTIAL_SUFFIX, filepath)
+    except OSError as e:
+        print(f"Error finishing file {filepath}: {e}")
+
+def discard_file(filepath):
+    """Deletes a partial file that won't be finished in this run."""
+    try:
+        os.remove(filepath + PARTIAL_SUFFIX)
+    except OSError as e:
+        print(f"Error discarding file {filepath}: {e}")
+
+def write_batch(batch):
+    """Writes a batch of (filepath, content, mode) writes in order.
+
+    The modes 'finish' and 'discard' have no content; they move the file's
+    partial copy into place, or delete it.
+    """
+    for filepath, content, mode in batch:
+        # One bad write is reported and skipped; it must not take the writer down with it.
+        try:
+            if mode == 'finish':
+                finish_file(filepath)
+            elif mode == 'discard':
+                discard_file(filepath)
+            else:
+                write_to_file(filepath, content, mode)
+        except Exception as e:
+            print(f"Error writing to file {filepath}: {e!r}")
+
+async def file_writer(writes):
+    """Drains the write queue in batches until it receives None.
+
+    Each batch is written in a worker thread so scrapers never block on disk.
+    """
+    done = False
+    while not done:
+        batch = []
+        item = await writes.get()
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= WRITE_BATCH_SIZE or writes.empty():
+                break
+            item = writes.get_nowait()
+        done = item is None
+        if batch:
+            await asyncio.to_thread(write_batch, batch)
+
 # --- Main Scraping Logic ---
 
-def scrape_post_content(topic_url):
-    """Scrapes all posts from a single topic page, handling pagination."""
-    all_posts_text = []
+def parse_post_page(content):
+    """Extracts the formatted posts and the next page link from one topic page.
+
+    This is pure CPU work on the raw page body, so it runs in a worker
+    process. Returns a (posts_text, next_href) pair, where posts_text is a
+    list of text pieces and next_href is None on the last page, or None if
+    the page couldn't be parsed.
+    """
+    try:
+        # Hand lxml the raw bytes so it can detect the encoding itself.
+        tree = lxml.html.document_fromstring(content)
+    except ParserError:
+        # The exception can't be pickled back to the main process, so report it as a result.
+        return None
+    posts_text = []
+
+    # Each post lives in a 'div.post_wrap'; everything else is looked up within it.
+    for post_wrap in POST_WRAPS(tree):
+        # The main content of a post is 'div.post.entry-content'.
+        post_content_div = first(POST_BODY(post_wrap))
+        if post_content_div is None:
+            continue
+
+        # --- Extract Username and Post Date ---
+        author_h3 = first(AUTHOR(post_wrap))
+        posted_info_p = first(POSTED(post_wrap))
+
+        username = short_text(author_h3) if author_h3 is not None else "Unknown User"
+        post_date = short_text(posted_info_p) if posted_info_p is not None else "Unknown Date"
+        post_date = _POSTNUM_RE.sub('', post_date.replace('Posted ', '')).strip() # Clean up the date string
+
+        # --- Extract Post Content ---
+        # Leave out quotes and code blocks to get clean text. Images carry no text.
+        post_content = join_text(post_text(post_content_div), "\n")
+
+        # --- Extract Signature ---
+        signature_content = ""
+        # The signature is a sibling to the post_content div's parent container
+        signature_div = first(SIGNATURE(post_wrap))
+        if signature_div is not None:
+            signature_content = get_text(signature_div, "\n")
+
+        # --- Assemble Post Text ---
+        posts_text.append(f"--- User: {username} | Date: {post_date} ---\n\n{post_content}")
+        if signature_content:
+            posts_text.append(f"\n--- Signature ---\n{signature_content}")
+        posts_text.append(_SEP)
+
+    # Find the "Next" page link
+    return posts_text, first(NEXT(tree)) or None
+
+
+class TopicIncomplete(Exception):
+    """Raised when a topic page fails for now, like a timeout or a server error, leaving the topic unfinished."""
+
+
+async def scrape_post_content(session, cache, sem, pool, topic_url):
+    """Scrapes all posts from a single topic, handling pagination.
+
+    Yields the text of one page of posts at a time, so a long topic is never
+    held in memory all at once. A page that is missing for good (a client
+    error, or a body that won't parse) ends the topic with the pages scraped
+    so far. A page that fails for now raises TopicIncomplete instead.
+    """
+    loop = asyncio.get_running_loop()
     current_page_url = topic_url
 
     while current_page_url:
-        soup = make_soup(current_page_url)
-        if not soup:
+        try:
+            content = await fetch(session, cache, current_page_url, sem)
+        except PageUnavailable:
             break
+        if content is None:
+            raise TopicIncomplete(current_page_url)
+
+        # Parsing is CPU-bound, so hand it to the process pool and keep fetching.
+        parsed = await loop.run_in_executor(pool, parse_post_page, content)
+        if parsed is None:
+            print(f"Error parsing {current_page_url}: no document found")
+            cache_drop(cache, current_page_url)
+            break
+        posts_text, next_href = parsed
+        if posts_text:
+            yield "\n".join(posts_text)
 
-        # The correct selector for the main content of a post is 'div.post.entry-content'.
-        post_content_divs = soup.select('div.post.entry-content')
-
-        for post_content_div in post_content_divs:
-            # We find the main container for the whole post and then select specific elements within it.
-            post_wrap = post_content_div.find_parent('div', class_='post_wrap')
-            if not post_wrap:
-                continue
-
-            # --- Extract Username and Post Date ---
-            author_h3 = post_wrap.select_one('h3.author')
-            posted_info_p = post_wrap.select_one('p.posted_info')
-
-            username = author_h3.get_text(strip=True) if author_h3 else "Unknown User"
-            post_date = posted_info_p.get_text(strip=True) if posted_info_p else "Unknown Date"
-            post_date = re.sub(r'Posted |#\d+', '', post_date).strip() # Clean up the date string
-
-            # --- Extract Post Content ---
-            # Remove quotes, code blocks, and images to get clean text
-            for block in post_content_div.select('div.blockquote, pre.prettyprint, img'):
-                block.decompose()
-            
-            post_content = post_content_div.get_text("\n", strip=True)
-
-            # --- Extract Signature ---
-            signature_content = ""
-            # The signature is a sibling to the post_content div's parent container
-            signature_div = post_wrap.find('div', class_='signature')
-            if signature_div:
-                for img in signature_div.find_all('img'):
-                    img.decompose()
-                signature_content = signature_div.get_text("\n", strip=True).strip()
-
-            # --- Assemble Post Text ---
-            all_posts_text.append(f"--- User: {username} | Date: {post_date} ---\n\n{post_content}")
-            if signature_content:
-                all_posts_text.append(f"\n--- Signature ---\n{signature_content}")
-            all_posts_text.append("\n" + "="*80 + "\n")
-
-        # Find the "Next" page link
-        next_link = soup.select_one('a[rel="next"]')
-        if next_link and next_link['href']:
+        if next_href:
             # FIXED: Use the new resolver function with the current page URL as the base.
-            current_page_url = resolve_url(current_page_url, next_link['href'])
+            current_page_url = resolve_url(current_page_url, next_href)
         else:
             current_page_url = None
 
-    return "\n".join(all_posts_text)
 
+def topic_saved(filepath):
+    """Checks whether a previous run already saved this topic."""
+    try:
+        return os.path.getsize(filepath) > 0
+    except OSError:
+        return False
+
+async def scrape_topic(session, cache, sem, pool, writes, topic_title, topic_url, filepath):
+    """Streams a topic's posts into its file, one page at a time.
+
+    Pages go to a partial file that only takes the final name once the last
+    page is written, so a topic cut short by a crash or a temporary failure
+    is scraped again on the next run. Topics saved by an earlier run are skipped
+    without any fetch. Returns True if the topic's file exists afterwards.
+    """
+    if topic_saved(filepath):
+        print(f"  Skipping Saved Topic: {topic_title}")
+        return True
+
+    print(f"  Scraping Topic: {topic_title}")
+    partial_filepath = filepath + PARTIAL_SUFFIX
+    wrote = False
+    try:
+        async for page_text in scrape_post_content(session, cache, sem, pool, topic_url):
+            if wrote:
+                await writes.put((partial_filepath, "\n" + page_text, 'a'))
+            else:
+                await writes.put((partial_filepath, page_text, 'w'))
+                wrote = True
+    except TopicIncomplete as e:
+        # Leave the topic unsaved so the next run scrapes it again.
+        print(f"  Topic Incomplete, Not Saved: {topic_title} (failed at {e})")
+        if wrote:
+            await writes.put((filepath, None, 'discard'))
+        return False
+    if wrote:
+        await writes.put((filepath, None, 'finish'))
+    return wrote
+
+
+def extract_topics(tree, page_url, current_path, claimed_filepaths):
+    """Lists the topics on one forum page as (title, url, filepath) tuples.
+
+    claimed_filepaths maps each filepath already handed out in this forum to
+    its topic URL. A different topic whose name and date give the same
+    filename gets its topic id appended, so no two topics write the same
+    file. Rows without a usable link, and topics already listed, are dropped.
+    """
+    topics = []
+
+    # More specific selector for topic rows to avoid header/footer rows
+    topic_rows = TOPIC_ROWS(tree)
+
+    for row in topic_rows:
+        # A more robust selector for the topic link
+        topic_link_tag = first(TOPIC_LINK(row))
+        if topic_link_tag is None or not topic_link_tag.get('href'):
+            continue
+
+        topic_title = short_text(topic_link_tag)
+        # FIXED: Use the new resolver function with the current page URL as the base.
+        topic_url = resolve_url(page_url, topic_link_tag.get('href'))
+
+        last_post_cell = first(LAST_ACTION(row))
+        last_post_date_str = short_text(last_post_cell) if last_post_cell is not None else "nodate"
+
+        # Simple date extraction from text like "25 December 2019"
+        match = _DATE_RE.search(last_post_date_str)
+        date_prefix = match.group(1).replace(" ","-") if match else "unknown_date"
+
+        sanitized_title = sanitize_filename(topic_title)
+        filename = f"{date_prefix}-{sanitized_title}.txt"
+        filepath = os.path.join(current_path, filename)
+        if claimed_filepaths.get(filepath) == topic_url:
+            continue
+        if filepath in claimed_filepaths:
+            id_match = _TOPIC_ID_RE.search(topic_url)
+            topic_id = id_match.group(1) if id_match else str(len(claimed_filepaths))
+            filename = f"{date_prefix}-{sanitized_title}-{topic_id}.txt"
+            filepath = os.path.join(current_path, filename)
+            if filepath in claimed_filepaths:
+                continue
+        claimed_filepaths[filepath] = topic_url
+        topics.append((topic_title, topic_url, filepath))
+
+    return topics
+
+
+async def scrape_topic_listing(session, cache, sem, pool, writes, forum_url, current_path):
+    """Scrapes all topics within a forum, handling pagination.
 
-def scrape_topic_listing(forum_url, current_path):
-    """Scrapes all topics within a forum, handling pagination."""
-    topic_listing = []
+    The forum's listing file is written as topics complete rather than at the end.
+    """
+    listing_filepath = os.path.join(current_path, "listing.txt")
+    await writes.put((listing_filepath, "", 'w'))
+    listed = False
+    claimed_filepaths = {}
     current_page_url = forum_url
 
     while current_page_url:
-        soup = make_soup(current_page_url)
-        if not soup:
+        tree = await parse_tree(session, cache, current_page_url, sem)
+        if tree is None:
             break
-        
-        # More specific selector for topic rows to avoid header/footer rows
-        topic_rows = soup.select('table.ipb_table tr[class^="row"]')
-
-        for row in topic_rows:
-            # A more robust selector for the topic link
-            topic_link_tag = row.select_one('td.col_f_topic a[href*="showtopic="]')
-            if not topic_link_tag:
-                continue
 
-            topic_title = topic_link_tag.get_text(strip=True)
-            # FIXED: Use the new resolver function with the current page URL as the base.
-            topic_url = resolve_url(current_page_url, topic_link_tag['href'])
-
-            last_post_cell = row.select_one('td.col_f_lastact')
-            last_post_date_str = last_post_cell.get_text(strip=True) if last_post_cell else "nodate"
-            
-            # Simple date extraction from text like "25 December 2019"
-            match = re.search(r'(\d{1,2}\s\w+\s\d{4})', last_post_date_str)
-            date_prefix = match.group(1).replace(" ","-") if match else "unknown_date"
-            
-            print(f"  Scraping Topic: {topic_title}")
-            post_content = scrape_post_content(topic_url)
-            
-            if post_content:
-                sanitized_title = sanitize_filename(topic_title)
-                filename = f"{date_prefix}-{sanitized_title}.txt"
-                filepath = os.path.join(current_path, filename)
-                write_to_file(filepath, post_content)
-                topic_listing.append(f"{topic_title} | {topic_url}")
+        # Work out every topic on the page first, then fetch them as one batch.
+        topics = extract_topics(tree, current_page_url, current_path, claimed_filepaths)
+
+        # Topics on a page are independent, so fetch them concurrently; the
+        # request semaphore bounds how many pages are in flight at once.
+        # Pages within one topic stay sequential since each links to the next.
+        written = await asyncio.gather(
+            *[scrape_topic(session, cache, sem, pool, writes, topic_title, topic_url, filepath)
+              for topic_title, topic_url, filepath in topics]
+        )
+
+        for (topic_title, topic_url, _), wrote in zip(topics, written):
+            if wrote:
+                entry = f"{topic_title} | {topic_url}"
+                await writes.put((listing_filepath, "\n" + entry if listed else entry, 'a'))
+                listed = True
 
         # The next page link in topic lists often has rel="next"
-        next_link = soup.select_one('a[rel="next"]')
-        if next_link and next_link['href']:
+        next_href = first(NEXT(tree))
+        if next_href:
              # FIXED: Use the new resolver function with the current page URL as the base.
-             current_page_url = resolve_url(current_page_url, next_link['href'])
+             current_page_url = resolve_url(current_page_url, next_href)
         else:
             current_page_url = None
 
-    listing_filepath = os.path.join(current_path, "listing.txt")
-    write_to_file(listing_filepath, "\n".join(topic_listing))
-
 
-def scrape_forum_index(url, current_path):
+async def scrape_forum_index(session, cache, sem, pool, writes, url, current_path):
     """Scrapes the main index page for all forums and kicks off sub-scraping."""
-    soup = make_soup(url)
-    if not soup:
+    tree = await parse_tree(session, cache, url, sem)
+    if tree is None:
         return []
 
     all_forums_found = []
-    
+    seen_forum_urls = set()
+
     # Categories are separated by tables with class 'ipb_table'
-    category_tables = soup.select('table.ipb_table')
+    category_tables = CATEGORY_TABLES(tree)
 
     for category_table in category_tables:
         # Selecting rows within each category table directly is more reliable
-        rows = category_table.select('tr')
+        rows = category_table.iter('tr')
         for row in rows:
-            main_forum_link_tag = row.select_one('td h4 a[href*="showforum="]')
-            if not main_forum_link_tag:
+            main_forum_link_tag = first(FORUM_LINK(row))
+            if main_forum_link_tag is None:
                 continue
 
-            forum_name = main_forum_link_tag.get_text(strip=True)
+            forum_name = get_text(main_forum_link_tag)
             # FIXED: Use the new resolver function with the index page URL as the base.
-            forum_url = resolve_url(url, main_forum_link_tag['href'])
-            
-            if any(forum_url in f for f in all_forums_found):
+            forum_url = resolve_url(url, main_forum_link_tag.get('href'))
+
+            if forum_url in seen_forum_urls:
                 continue
-                
+            seen_forum_urls.add(forum_url)
+
             print(f"\nProcessing Forum: {forum_name}")
             all_forums_found.append(f"{forum_name} | {forum_url}")
 
             sanitized_name = sanitize_filename(forum_name)
             forum_path = os.path.join(current_path, sanitized_name)
-            scrape_topic_listing(forum_url, forum_path)
-            
+            # Create the directory now so the writer never has to on the hot path.
+            ensure_dir(forum_path)
+            await scrape_topic_listing(session, cache, sem, pool, writes, forum_url, forum_path)
+
             # Sub-forums are in a <span class="desc">
-            parent_td = main_forum_link_tag.find_parent('td')
-            if parent_td:
-                desc_span = parent_td.find('span', class_='desc')
-                if desc_span:
-                    subforum_links = desc_span.select('a[href*="showforum="]')
+            parent_td = first(PARENT_TD(main_forum_link_tag))
+            if parent_td is not None:
+                desc_span = first(DESC_SPAN(parent_td))
+                if desc_span is not None:
+                    subforum_links = SUBFORUM_LINKS(desc_span)
                     for subforum_link in subforum_links:
-                         subforum_name = subforum_link.get_text(strip=True)
+                         subforum_name = get_text(subforum_link)
                          if not subforum_name: continue
 
                          # FIXED: Use the new resolver function with the index page URL as the base.
-                         subforum_url = resolve_url(url, subforum_link['href'])
-                         
+                         subforum_url = resolve_url(url, subforum_link.get('href'))
+
                          print(f"  Processing Sub-Forum: {subforum_name}")
                          all_forums_found.append(f"  - {subforum_name} | {subforum_url}")
+                         seen_forum_urls.add(subforum_url)
 
                          subforum_sanitized_name = sanitize_filename(subforum_name)
                          subforum_path = os.path.join(forum_path, subforum_sanitized_name)
-                         scrape_topic_listing(subforum_url, subforum_path)
-    
+                         ensure_dir(subforum_path)
+                         await scrape_topic_listing(session, cache, sem, pool, writes, subforum_url, subforum_path)
+
     return all_forums_found
 
 # --- Main Execution ---
-if __name__ == "__main__":
+async def main():
     print("Starting scrape of the main forum page...")
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    # Start scraping from the main index page
-    all_forums = scrape_forum_index(BASE_URL + "index.php", OUTPUT_DIR)
-    
+    ensure_dir(OUTPUT_DIR)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    cache = open_cache(CACHE_PATH)
+    writes = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+    writer = asyncio.create_task(file_writer(writes))
+    try:
+        # Workers start lazily, once the writer and resolver threads exist, and
+        # forking a threaded process can deadlock, so start them from a clean process.
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        mp_context = multiprocessing.get_context(start_method)
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=mp_context) as pool:
+            async with make_session() as session:
+                # Start scraping from the main index page
+                scrape = asyncio.create_task(scrape_forum_index(
+                    session, cache, sem, pool, writes, BASE_URL + "index.php", OUTPUT_DIR
+                ))
+                # If the writer dies, scrapers would block forever on a full
+                # queue, so stop the scrape and fail instead of hanging.
+                await asyncio.wait({scrape, writer}, return_when=asyncio.FIRST_COMPLETED)
+                if not scrape.done():
+                    scrape.cancel()
+                    writer.result()
+                    raise RuntimeError("File writer stopped before the scrape finished.")
+                all_forums = scrape.result()
+    finally:
+        cache.close()
+        # Let the writer flush everything still queued before finishing.
+        if not writer.done():
+            await writes.put(None)
+        await writer
+
     if all_forums:
         forums_filepath = os.path.join(OUTPUT_DIR, "listing.txt")
         write_to_file(forums_filepath, "\n".join(all_forums))
@@ -250,3 +665,6 @@ if __name__ == "__main__":
         print(f"All data saved in the '{OUTPUT_DIR}' directory.")
     else:
         print("\nCould not find any forums to scrape. The script will now exit.")
+
+if __name__ == "__main__":
+    asyncio.run(main())